@@ -0,0 +1,246 @@
+import json
+import struct
+from itertools import accumulate
+from typing import Dict, Iterator, List
+
+# Binary layout (little endian):
+#   record: flags:u8, match_percentage:f64, ats_score:f64,
+#           item counts of the five string lists:5*u32
+#           (matching, missing, suggestions, ats issues, ats improvements),
+#           length of every string in code points:u32 each,
+#           all strings concatenated as a single UTF-8 blob
+#   result file: MAGIC, then per record length:u32 + record
+# Keeping the text in one blob lets a record decode with a single UTF-8 call.
+MAGIC = b"RAR\x01"
+
+_HEADER = struct.Struct("<Bdd5I")
+_U32 = struct.Struct("<I")
+
+_MATCH_IS_INT = 0x01
+_SCORE_IS_INT = 0x02
+_WILL_PASS = 0x04
+
+
+def _check_number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    if value < 0 or value > 100:
+        raise ValueError(f"{name} must be between 0 and 100")
+
+
+def _check_bool(value, name):
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be a boolean")
+    return value
+
+
+def _check_strings(value, name):
+    if not isinstance(value, list):
+        raise ValueError(f"{name} must be a list")
+    for item in value:
+        if not isinstance(item, str):
+            raise ValueError(f"{name} must only contain strings")
+    return value
+
+
+class ATSCompatibility:
+    """ATS compatibility section of an analysis"""
+
+    __slots__ = ("score", "will_pass_ats", "issues", "improvements")
+
+    def __init__(self, score, will_pass_ats, issues, improvements):
+        self.score = score
+        self.will_pass_ats = will_pass_ats
+        self.issues = issues
+        self.improvements = improvements
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ATSCompatibility":
+        """Validate and build from the parsed model output"""
+        if not isinstance(data, dict):
+            raise ValueError("ats_compatibility must be an object")
+        for field in cls.__slots__:
+            if field not in data:
+                raise ValueError(f"Missing ATS compatibility field: {field}")
+        _check_number(data['score'], "ats_compatibility.score")
+        return cls(
+            data['score'],
+            _check_bool(data['will_pass_ats'], "ats_compatibility.will_pass_ats"),
+            _check_strings(data['issues'], "ats_compatibility.issues"),
+            _check_strings(data['improvements'], "ats_compatibility.improvements"),
+        )
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, ATSCompatibility):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"ATSCompatibility(score={self.score!r}, will_pass_ats={self.will_pass_ats!r})"
+
+
+class AnalysisResult:
+    """Validated result of matching a resume against a job description"""
+
+    __slots__ = ("match_percentage", "matching_keywords", "missing_keywords",
+                 "suggestions", "ats_compatibility")
+
+    def __init__(self, match_percentage, matching_keywords: List[str], missing_keywords: List[str],
+                 suggestions: List[str], ats_compatibility: ATSCompatibility):
+        self.match_percentage = match_percentage
+        self.matching_keywords = matching_keywords
+        self.missing_keywords = missing_keywords
+        self.suggestions = suggestions
+        self.ats_compatibility = ats_compatibility
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AnalysisResult":
+        """Validate and build from the parsed model output"""
+        if not isinstance(data, dict):
+            raise ValueError("Analysis must be a JSON object")
+        for field in cls.__slots__:
+            if field not in data:
+                raise ValueError(f"Missing required field: {field}")
+        _check_number(data['match_percentage'], "match_percentage")
+        return cls(
+            data['match_percentage'],
+            _check_strings(data['matching_keywords'], "matching_keywords"),
+            _check_strings(data['missing_keywords'], "missing_keywords"),
+            _check_strings(data['suggestions'], "suggestions"),
+            ATSCompatibility.from_dict(data['ats_compatibility']),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "AnalysisResult":
+        return cls.from_dict(json.loads(text))
+
+    def to_dict(self) -> Dict:
+        return {
+            'match_percentage': self.match_percentage,
+            'matching_keywords': self.matching_keywords,
+            'missing_keywords': self.missing_keywords,
+            'suggestions': self.suggestions,
+            'ats_compatibility': self.ats_compatibility.to_dict(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def to_bytes(self) -> bytes:
+        """Encode in the compact binary format"""
+        ats = self.ats_compatibility
+        flags = 0
+        if isinstance(self.match_percentage, int):
+            flags |= _MATCH_IS_INT
+        if isinstance(ats.score, int):
+            flags |= _SCORE_IS_INT
+        if ats.will_pass_ats:
+            flags |= _WILL_PASS
+
+        lists = (self.matching_keywords, self.missing_keywords, self.suggestions,
+                 ats.issues, ats.improvements)
+        strings = [s for strings in lists for s in strings]
+        header = _HEADER.pack(flags, self.match_percentage, ats.score, *map(len, lists))
+        lengths = struct.pack(f"<{len(strings)}I", *map(len, strings))
+        # surrogatepass keeps lone surrogates from split \ud83d-style escapes round-tripping
+        return b"".join((header, lengths, "".join(strings).encode("utf-8", "surrogatepass")))
+
+    @classmethod
+    def from_bytes(cls, data) -> "AnalysisResult":
+        """Decode a record produced by to_bytes"""
+        view = memoryview(data)
+        try:
+            flags, match_percentage, score, *counts = _HEADER.unpack_from(view, 0)
+            total = sum(counts)
+            lengths = struct.unpack_from(f"<{total}I", view, _HEADER.size)
+            text = str(view[_HEADER.size + 4 * total:], "utf-8", "surrogatepass")
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt analysis record: {str(e)}")
+        if sum(lengths) != len(text):
+            raise ValueError("Corrupt analysis record: string lengths do not match text")
+
+        ends = list(accumulate(lengths))
+        starts = [0] + ends
+        strings = [text[start:end] for start, end in zip(starts, ends)]
+        lists = []
+        position = 0
+        for count in counts:
+            lists.append(strings[position:position + count])
+            position += count
+
+        if flags & _MATCH_IS_INT:
+            match_percentage = int(match_percentage)
+        if flags & _SCORE_IS_INT:
+            score = int(score)
+        ats = ATSCompatibility(score, bool(flags & _WILL_PASS), lists[3], lists[4])
+        return cls(match_percentage, lists[0], lists[1], lists[2], ats)
+
+    def __eq__(self, other):
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return (f"AnalysisResult(match_percentage={self.match_percentage!r}, "
+                f"ats_compatibility={self.ats_compatibility!r})")
+
+
+def find_invalid_fields(data: Dict) -> List[str]:
+    """Return the dotted names of fields that are missing or fail validation"""
+    checks = (
+        (data, "match_percentage", _check_number),
+        (data, "matching_keywords", _check_strings),
+        (data, "missing_keywords", _check_strings),
+        (data, "suggestions", _check_strings),
+    )
+    ats = data.get('ats_compatibility')
+    ats_checks = (
+        (ats, "score", _check_number),
+        (ats, "will_pass_ats", _check_bool),
+        (ats, "issues", _check_strings),
+        (ats, "improvements", _check_strings),
+    )
+
+    invalid = []
+    for prefix, group in (("", checks), ("ats_compatibility.", ats_checks)):
+        for section, field, check in group:
+            name = prefix + field
+            try:
+                if not isinstance(section, dict) or field not in section:
+                    raise ValueError(f"Missing field: {name}")
+                check(section[field], name)
+            except ValueError:
+                invalid.append(name)
+    return invalid
+
+
+def write_results(fp, results) -> int:
+    """Write results to a binary file object, returning the number written"""
+    fp.write(MAGIC)
+    count = 0
+    for result in results:
+        record = result.to_bytes()
+        fp.write(_U32.pack(len(record)))
+        fp.write(record)
+        count += 1
+    return count
+
+
+def iter_results(fp) -> Iterator[AnalysisResult]:
+    """Stream results from a binary file object one record at a time"""
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an analysis result file")
+    while True:
+        prefix = fp.read(_U32.size)
+        if not prefix:
+            return
+        if len(prefix) != _U32.size:
+            raise ValueError("Truncated analysis result file")
+        (length,) = _U32.unpack(prefix)
+        record = fp.read(length)
+        if len(record) != length:
+            raise ValueError("Truncated analysis result file")
+        yield AnalysisResult.from_bytes(record)
@@ -1,13 +1,14 @@
 import streamlit as st
-import json
 from pathlib import Path
 from text_processing import TextProcessor
 from keyword_extraction import KeywordExtractor
+from dedup import DuplicateDetector
+from response_repair import ResponseRecovery
 import os
 from dotenv import load_dotenv
 
 class ResumeAnalyzer:
-    def __init__(self):
+    def __init__(self, duplicate_detector=None, response_recovery=None):
         # Load environment variables
         load_dotenv()
         
@@ -16,14 +17,28 @@ class ResumeAnalyzer:
         if not api_key:
             raise ValueError("Please set GOOGLE_API_KEY in .env file")
             
-        self.keyword_extractor = KeywordExtractor(api_key)
+        self.keyword_extractor = KeywordExtractor(api_key, response_recovery)
         self.text_processor = TextProcessor()
 
-    def analyze_resume(self, resume_text: str, job_desc: str):
+        # Reuse analyses of near-duplicate resumes instead of calling the model again
+        self.duplicate_detector = duplicate_detector or DuplicateDetector.from_env()
+        self.last_duplicate_similarity = None
+
+    def analyze_resume(self, resume_text: str, job_desc: str, force: bool = False):
         try:
+            # Skip the LLM call when a near-duplicate resume was already analyzed,
+            # unless the caller asked for a fresh analysis (e.g. after editing the resume)
+            signature = self.duplicate_detector.signature(resume_text)
+            duplicate = None if force else self.duplicate_detector.find(resume_text, job_desc, signature)
+            if duplicate:
+                analysis, self.last_duplicate_similarity = duplicate
+                return analysis
+            self.last_duplicate_similarity = None
+
             # Perform analysis
-            result_str = self.keyword_extractor.analyze_match(resume_text, job_desc)
-            return json.loads(result_str)
+            analysis = self.keyword_extractor.analyze_match(resume_text, job_desc)
+            self.duplicate_detector.add(resume_text, analysis, job_desc, signature)
+            return analysis
         except Exception as e:
             raise Exception(f"Analysis failed: {str(e)}")
 
@@ -34,8 +49,14 @@ def main():
         layout="wide"
     )
 
+    # Keep the duplicate index and response counters across Streamlit reruns
+    if 'duplicate_detector' not in st.session_state:
+        st.session_state['duplicate_detector'] = DuplicateDetector.from_env()
+    if 'response_recovery' not in st.session_state:
+        st.session_state['response_recovery'] = ResponseRecovery()
+
     # Initialize the analyzer
-    analyzer = ResumeAnalyzer()
+    analyzer = ResumeAnalyzer(st.session_state['duplicate_detector'], st.session_state['response_recovery'])
 
     # Title
     st.title("Smart Job Matching: See How Well Your Resume Fits")
@@ -102,6 +123,11 @@ def main():
         # Analysis Results
         st.subheader("Analysis Results")
         
+        reanalyze = st.checkbox(
+            "Re-analyze anyway",
+            help="Request a fresh analysis even if a near-duplicate resume was analyzed before, e.g. after editing it"
+        )
+        
         if st.button("Analyze Match", type="primary"):
             if not uploaded_file:
                 st.error("Please upload a resume first")
@@ -110,18 +136,27 @@ def main():
             else:
                 try:
                     with st.spinner("Analyzing..."):
-                        analysis = analyzer.analyze_resume(st.session_state['resume_text'], job_desc)
+                        analysis = analyzer.analyze_resume(st.session_state['resume_text'], job_desc, force=reanalyze)
+                    
+                    if analyzer.last_duplicate_similarity is not None:
+                        report = analyzer.duplicate_detector.report()
+                        st.info(
+                            f"Near-duplicate of a resume analyzed earlier "
+                            f"({analyzer.last_duplicate_similarity:.0%} similar), reusing its analysis. "
+                            f"Tick 'Re-analyze anyway' to request a fresh one. "
+                            f"LLM calls avoided this session: {report['llm_calls_avoided']}"
+                        )
                     
                     # Display results
                     col2_1, col2_2 = st.columns(2)
                     
                     with col2_1:
-                        st.metric("Match Percentage", f"{analysis['match_percentage']}%")
-                        st.progress(analysis['match_percentage'] / 100)
+                        st.metric("Match Percentage", f"{analysis.match_percentage}%")
+                        st.progress(analysis.match_percentage / 100)
                     
                     with col2_2:
-                        ats_score = analysis['ats_compatibility']['score']
-                        will_pass = analysis['ats_compatibility']['will_pass_ats']
+                        ats_score = analysis.ats_compatibility.score
+                        will_pass = analysis.ats_compatibility.will_pass_ats
                         st.metric(
                             "ATS Compatibility", 
                             f"{ats_score}%",
@@ -131,28 +166,36 @@ def main():
                     
                     # Keywords and Suggestions
                     with st.expander("Matching Keywords", expanded=True):
-                        st.write(", ".join(analysis['matching_keywords']))
+                        st.write(", ".join(analysis.matching_keywords))
                     
                     with st.expander("Missing Keywords", expanded=True):
-                        st.write(", ".join(analysis['missing_keywords']))
+                        st.write(", ".join(analysis.missing_keywords))
                     
                     with st.expander("Improvement Suggestions", expanded=True):
-                        for suggestion in analysis['suggestions']:
+                        for suggestion in analysis.suggestions:
                             st.write(f"• {suggestion}")
                     
                     # ATS-specific feedback
                     with st.expander("ATS Optimization", expanded=True):
-                        # if analysis['ats_compatibility']['issues']:
+                        # if analysis.ats_compatibility.issues:
                         #     st.subheader("Issues Detected")
-                        #     for issue in analysis['ats_compatibility']['issues']:
+                        #     for issue in analysis.ats_compatibility.issues:
                         #         st.write(f"⚠️ {issue}")
                         
                         st.subheader("Recommended Checks")
-                        for improvement in analysis['ats_compatibility']['improvements']:
+                        for improvement in analysis.ats_compatibility.improvements:
                             st.write(f"📝 {improvement}")
                     
                 except Exception as e:
                     st.error(f"Analysis failed: {str(e)}")
+                
+                # Model response health for this session
+                stats = analyzer.keyword_extractor.recovery.report()
+                st.caption(
+                    f"Model responses: {stats['clean']} clean, {stats['recovered']} recovered, "
+                    f"{stats['failed']} failed, {stats['api_errors']} API errors "
+                    f"({stats['followup_calls']} follow-up calls, {stats['full_retries']} full retries)"
+                )
 
 if __name__ == "__main__":
     main()
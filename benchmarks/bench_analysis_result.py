@@ -0,0 +1,84 @@
+"""Throughput and size benchmark for the binary analysis result format versus JSON.
+
+Serializing is roughly 2-3x faster than JSON. Parsing is on par with
+json.loads plus validation, not faster, and files are about 90% of the JSON
+size because the text itself dominates.
+
+Usage:
+    python benchmarks/bench_analysis_result.py [records]
+"""
+import gc
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_result import AnalysisResult, iter_results, write_results  # noqa: E402
+
+WORDS = ("python", "kubernetes", "leadership", "sql", "machine learning", "agile",
+         "aws", "communication", "docker", "rest apis", "data analysis", "react")
+
+
+def _sample(rng):
+    def phrases(n, suffix):
+        return [f"{rng.choice(WORDS)} ({suffix})" for _ in range(n)]
+
+    return {
+        "match_percentage": rng.randint(0, 100),
+        "matching_keywords": phrases(rng.randint(5, 15), "mentioned in experience section"),
+        "missing_keywords": phrases(rng.randint(3, 10), "high importance"),
+        "suggestions": phrases(rng.randint(3, 6), "add a quantified achievement demonstrating this"),
+        "ats_compatibility": {
+            "score": rng.randint(0, 100),
+            "will_pass_ats": rng.random() > 0.5,
+            "issues": phrases(rng.randint(1, 4), "uses a non-standard section heading"),
+            "improvements": phrases(rng.randint(2, 5), "move this keyword into the summary"),
+        },
+    }
+
+
+def _timed(label, count, func):
+    # Like timeit, keep the cyclic GC from skewing whichever run allocates the most
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    print(f"{label:<28}{count / elapsed:>14,.0f} records/s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(0)
+    results = [AnalysisResult.from_dict(_sample(rng)) for _ in range(count)]
+
+    json_lines = _timed("serialize JSON", count,
+                        lambda: [r.to_json() for r in results])
+    records = _timed("serialize binary", count,
+                     lambda: [r.to_bytes() for r in results])
+    _timed("parse + validate JSON", count,
+           lambda: [AnalysisResult.from_json(line) for line in json_lines])
+    decoded = _timed("parse binary", count,
+                     lambda: [AnalysisResult.from_bytes(record) for record in records])
+    assert decoded == results
+
+    json_file = "\n".join(json_lines).encode("utf-8")
+    binary_file = io.BytesIO()
+    write_results(binary_file, results)
+    binary_file.seek(0)
+    streamed = _timed("stream binary file", count, lambda: sum(1 for _ in iter_results(binary_file)))
+    assert streamed == count
+
+    json_size, binary_size = len(json_file), len(binary_file.getvalue())
+    print(f"{'JSON lines size':<28}{json_size:>14,} bytes")
+    print(f"{'binary file size':<28}{binary_size:>14,} bytes ({binary_size / json_size:.0%} of JSON)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Peak RSS benchmark for handing large documents to the PDF extraction backends.
+
+Each strategy runs in a fresh subprocess so peak memory is measured in
+isolation. The backends themselves are simulated by streaming the document in
+chunks (or, for the legacy PyMuPDF path, reading it whole), which is the part
+of extraction that depends on how the document is passed around.
+
+Usage:
+    python benchmarks/bench_document_source.py [size_mb]
+"""
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_source import DocumentSource  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+BACKENDS = 4
+
+
+def _rss_anon_kb():
+    """Current anonymous (non file-backed) resident memory in KiB, Linux only"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _consume(stream):
+    while stream.read(CHUNK_SIZE):
+        pass
+
+
+def run_legacy(path, samples):
+    # Mirrors the old code: upload copy, read() copy, BytesIO per backend, .read() for PyMuPDF
+    with open(path, "rb") as f:
+        uploaded_file = io.BytesIO(f.read())
+    pdf_bytes = uploaded_file.read()
+    for i in range(BACKENDS):
+        pdf_file = io.BytesIO(pdf_bytes)
+        if i == 0:
+            data = pdf_file.read()
+            samples.append(_rss_anon_kb())
+            del data
+        else:
+            _consume(pdf_file)
+        samples.append(_rss_anon_kb())
+
+
+def run_upload(path, samples):
+    with open(path, "rb") as f:
+        uploaded_file = io.BytesIO(f.read())
+    with DocumentSource.from_upload(uploaded_file) as source:
+        for _ in range(BACKENDS):
+            with source.open() as pdf_file:
+                _consume(pdf_file)
+            samples.append(_rss_anon_kb())
+
+
+def run_mmap(path, samples):
+    with DocumentSource.from_path(path) as source:
+        for _ in range(BACKENDS):
+            with source.open() as pdf_file:
+                _consume(pdf_file)
+            samples.append(_rss_anon_kb())
+
+
+STRATEGIES = {
+    "legacy": run_legacy,
+    "upload": run_upload,
+    "mmap": run_mmap,
+}
+
+
+def _child(strategy, path):
+    samples = [_rss_anon_kb()]
+    STRATEGIES[strategy](path, samples)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{peak_kb} {max(samples)}")
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "large.pdf")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        print(f"Document size: {size_mb} MiB, {BACKENDS} backends")
+        print(f"{'strategy':<10}{'peak RSS (MiB)':>16}{'peak anon RSS (MiB)':>22}")
+        for strategy in STRATEGIES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", strategy, path],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            peak_kb, anon_kb = int(output[0]), int(output[1])
+            print(f"{strategy:<10}{peak_kb / 1024:>16.1f}{anon_kb / 1024:>22.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+    else:
+        main()
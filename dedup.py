@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+import unicodedata
+
+
+class DuplicateDetector:
+    """Detect near-duplicate resumes with MinHash signatures and a banded LSH index.
+
+    Resumes that are re-exported, re-uploaded or lightly edited produce almost
+    the same set of word shingles. Their MinHash signatures therefore collide in
+    at least one LSH band, and the estimated Jaccard similarity tells us whether
+    the earlier analysis can be reused instead of paying for another LLM call.
+    """
+
+    # Large Mersenne prime used for the universal hash family
+    _PRIME = (1 << 61) - 1
+    _MAX_HASH = (1 << 32) - 1
+
+    DEFAULT_THRESHOLD = 0.9
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=128, bands=32, shingle_size=5, seed=1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be between 0 and 1")
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        # Deterministic permutation coefficients so signatures are stable across runs
+        self._permutations = []
+        for i in range(num_perm):
+            digest = hashlib.sha256(f"{seed}:{i}".encode()).digest()
+            a, b = struct.unpack("<QQ", digest[:16])
+            self._permutations.append(((a % (self._PRIME - 1)) + 1, b % self._PRIME))
+
+        self._buckets = {}
+        self._entries = []
+
+        self.lookups = 0
+        self.llm_calls_avoided = 0
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Build a detector using the DUPLICATE_THRESHOLD environment variable"""
+        value = os.getenv('DUPLICATE_THRESHOLD')
+        threshold = cls.DEFAULT_THRESHOLD
+        if value:
+            try:
+                threshold = float(value)
+                if not 0.0 < threshold <= 1.0:
+                    raise ValueError(threshold)
+            except ValueError:
+                logging.getLogger(__name__).warning(
+                    f"Invalid DUPLICATE_THRESHOLD {value!r}, using {cls.DEFAULT_THRESHOLD}")
+                threshold = cls.DEFAULT_THRESHOLD
+        return cls(threshold=threshold, **kwargs)
+
+    def normalize(self, text):
+        """Normalize text so formatting-only differences do not change the signature"""
+        text = unicodedata.normalize("NFKC", text or "").lower()
+        text = re.sub(r"[^\w\s]", " ", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def _shingles(self, text):
+        """Split normalized text into hashed word shingles"""
+        words = self.normalize(text).split()
+        if len(words) < self.shingle_size:
+            grams = [" ".join(words)] if words else []
+        else:
+            grams = (" ".join(words[i:i + self.shingle_size])
+                     for i in range(len(words) - self.shingle_size + 1))
+        return {struct.unpack("<I", hashlib.blake2b(g.encode(), digest_size=4).digest())[0]
+                for g in grams}
+
+    def signature(self, text):
+        """Compute the MinHash signature of a text"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return (self._MAX_HASH,) * self.num_perm
+
+        prime, max_hash = self._PRIME, self._MAX_HASH
+        return tuple(
+            min(((a * s + b) % prime) & max_hash for s in shingles)
+            for a, b in self._permutations
+        )
+
+    def similarity(self, sig_a, sig_b):
+        """Estimate Jaccard similarity from two MinHash signatures"""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / self.num_perm
+
+    def _band_keys(self, signature, context):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (context, band, signature[start:start + self.rows])
+
+    @staticmethod
+    def _context_key(context):
+        # Analyses are only interchangeable when run against the same job description
+        return hashlib.sha1(" ".join((context or "").split()).encode()).hexdigest()
+
+    def _matches(self, signature, context):
+        """Yield (index, similarity) for indexed entries above the threshold"""
+        candidates = set()
+        for key in self._band_keys(signature, context):
+            candidates.update(self._buckets.get(key, ()))
+
+        for index in candidates:
+            entry = self._entries[index]
+            if entry is None:
+                continue
+            score = self.similarity(signature, entry[0])
+            if score >= self.threshold:
+                yield index, score
+
+    def find(self, text, context="", signature=None):
+        """Return (analysis, similarity) for the closest indexed duplicate, or None
+
+        Pass a precomputed ``signature`` to reuse it for a following ``add``.
+        """
+        self.lookups += 1
+        if signature is None:
+            signature = self.signature(text)
+
+        best = None
+        for index, score in self._matches(signature, self._context_key(context)):
+            if best is None or score > best[1]:
+                best = (self._entries[index][1], score)
+
+        if best is not None:
+            self.llm_calls_avoided += 1
+            self.logger.info(f"Near-duplicate resume found (similarity {best[1]:.2f}), reusing analysis")
+        return best
+
+    def add(self, text, analysis, context="", signature=None):
+        """Index a text together with its analysis, superseding near-duplicates already indexed"""
+        if signature is None:
+            signature = self.signature(text)
+        context = self._context_key(context)
+
+        # A forced re-analysis replaces the stale result instead of competing with it
+        for index, _ in list(self._matches(signature, context)):
+            self._entries[index] = None
+
+        index = len(self._entries)
+        self._entries.append((signature, analysis))
+        for key in self._band_keys(signature, context):
+            self._buckets.setdefault(key, []).append(index)
+
+    def report(self):
+        """Summarize index size and how many LLM calls were avoided"""
+        return {
+            "indexed_resumes": sum(entry is not None for entry in self._entries),
+            "lookups": self.lookups,
+            "llm_calls_avoided": self.llm_calls_avoided,
+            "threshold": self.threshold,
+        }
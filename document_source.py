@@ -0,0 +1,141 @@
+import io
+import logging
+import mmap
+import os
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a shared buffer.
+
+    Each extraction backend gets its own reader with an independent position,
+    while all of them share the same underlying memory. Only the chunks a
+    backend actually asks for are copied out.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position: {pos}")
+        self._pos = pos
+        return pos
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        if end <= self._pos:
+            return b""
+        data = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class DocumentSource:
+    """A resume document held in memory exactly once.
+
+    Sources can be built from an upload buffer, a file path (memory-mapped) or
+    raw bytes. Extraction backends read from ``buffer``/``open()`` instead of
+    making their own copies of the document.
+    """
+
+    def __init__(self, data, name=None, path=None, mapping=None):
+        self.logger = logging.getLogger(__name__)
+        self.data = data
+        self.name = name
+        self.path = path
+        self._mapping = mapping
+        self.buffer = memoryview(data)
+
+    @classmethod
+    def from_upload(cls, uploaded_file):
+        """Wrap an uploaded file (e.g. a Streamlit UploadedFile)"""
+        if hasattr(uploaded_file, "getvalue"):
+            # BytesIO.getvalue() hands back the internal bytes object without copying
+            data = uploaded_file.getvalue()
+        else:
+            data = uploaded_file.read()
+        return cls(data, name=getattr(uploaded_file, "name", None))
+
+    @classmethod
+    def from_path(cls, path):
+        """Memory-map a file on disk"""
+        path = os.fspath(path)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", name=os.path.basename(path), path=path)
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, name=os.path.basename(path), path=path, mapping=mapping)
+
+    @classmethod
+    def from_bytes(cls, data, name=None):
+        """Wrap bytes or any other buffer-protocol object"""
+        return cls(data, name=name)
+
+    @classmethod
+    def coerce(cls, obj):
+        """Turn a path, bytes-like object or uploaded file into a DocumentSource"""
+        if isinstance(obj, cls):
+            return obj
+        if isinstance(obj, (str, os.PathLike)):
+            return cls.from_path(obj)
+        if isinstance(obj, (bytes, bytearray, memoryview, mmap.mmap)):
+            return cls.from_bytes(obj)
+        return cls.from_upload(obj)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def open(self):
+        """Return an independent read-only file object over the shared buffer"""
+        return BufferReader(self.buffer)
+
+    def close(self):
+        """Release the buffer and unmap the file, if any"""
+        self.buffer.release()
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # A backend still holds a view; the mapping is freed once it is collected
+                self.logger.warning(f"Could not unmap {self.path}: buffer still in use")
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,7 +4,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from text_processing import TextProcessor
 from keyword_extraction import KeywordExtractor
-import json
+from dedup import DuplicateDetector
 from tkinter.scrolledtext import ScrolledText
 from pathlib import Path
 
@@ -31,6 +31,9 @@ class ResumeAnalyzerGUI:
         self.keyword_extractor = KeywordExtractor(api_key)
         self.text_processor = TextProcessor()
         
+        # Reuse analyses of near-duplicate resumes instead of calling the model again
+        self.duplicate_detector = DuplicateDetector.from_env()
+        
         # Configure styles
         self.setup_styles()
         self.setup_gui()
@@ -95,6 +98,12 @@ class ResumeAnalyzerGUI:
                                   wrap=tk.WORD)
         self.jd_text.pack(fill=tk.BOTH, expand=True, pady=5)
         
+        # Bypass the near-duplicate cache, e.g. after editing the resume
+        self.force_reanalyze = tk.BooleanVar(value=False)
+        ttk.Checkbutton(left_panel,
+                       text="Re-analyze anyway",
+                       variable=self.force_reanalyze).pack(pady=(20, 0))
+        
         ModernButton(left_panel,
                     text="Analyze Match",
                     command=self.analyze).pack(pady=20)
@@ -191,10 +200,10 @@ class ResumeAnalyzerGUI:
                                  length=200,
                                  mode='determinate')
         progress.pack(side=tk.LEFT, padx=5)
-        progress['value'] = analysis['match_percentage']
+        progress['value'] = analysis.match_percentage
         
         ttk.Label(match_frame,
-                 text=f"{analysis['match_percentage']}%",
+                 text=f"{analysis.match_percentage}%",
                  style='Subtitle.TLabel').pack(side=tk.LEFT, padx=5)
         
         # Matching Keywords
@@ -202,7 +211,7 @@ class ResumeAnalyzerGUI:
         keyword_frame.pack(fill=tk.X, pady=10)
         
         keywords_text = ScrolledText(keyword_frame, height=3, wrap=tk.WORD)
-        keywords_text.insert("1.0", ", ".join(analysis['matching_keywords']))
+        keywords_text.insert("1.0", ", ".join(analysis.matching_keywords))
         keywords_text.config(state='disabled')
         keywords_text.pack(fill=tk.X)
         
@@ -211,7 +220,7 @@ class ResumeAnalyzerGUI:
         missing_frame.pack(fill=tk.X, pady=10)
         
         missing_text = ScrolledText(missing_frame, height=3, wrap=tk.WORD)
-        missing_text.insert("1.0", ", ".join(analysis['missing_keywords']))
+        missing_text.insert("1.0", ", ".join(analysis.missing_keywords))
         missing_text.config(state='disabled')
         missing_text.pack(fill=tk.X)
         
@@ -220,7 +229,7 @@ class ResumeAnalyzerGUI:
         suggestions_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         suggestions_text = ScrolledText(suggestions_frame, wrap=tk.WORD)
-        suggestions_text.insert("1.0", "\n".join(analysis['suggestions']))
+        suggestions_text.insert("1.0", "\n".join(analysis.suggestions))
         suggestions_text.config(state='disabled')
         suggestions_text.pack(fill=tk.BOTH, expand=True)
 
@@ -243,15 +252,42 @@ class ResumeAnalyzerGUI:
                      style='Subtitle.TLabel').pack(pady=20)
             self.root.update()
             
-            # Perform analysis
-            result_str = self.keyword_extractor.analyze_match(self.resume_text, job_desc)
-            analysis = json.loads(result_str)
+            # Skip the LLM call when a near-duplicate resume was already analyzed
+            signature = self.duplicate_detector.signature(self.resume_text)
+            duplicate = None
+            if not self.force_reanalyze.get():
+                duplicate = self.duplicate_detector.find(self.resume_text, job_desc, signature)
+            if duplicate:
+                analysis, similarity = duplicate
+            else:
+                # Perform analysis
+                analysis = self.keyword_extractor.analyze_match(self.resume_text, job_desc)
+                self.duplicate_detector.add(self.resume_text, analysis, job_desc, signature)
             
             # Display results
             self.display_results(analysis)
             
+            if duplicate:
+                report = self.duplicate_detector.report()
+                messagebox.showinfo("Duplicate Resume",
+                    f"This resume is {similarity:.0%} similar to one analyzed earlier, "
+                    f"so its analysis was reused. Tick 'Re-analyze anyway' for a fresh one.\n"
+                    f"LLM calls avoided this session: {report['llm_calls_avoided']}")
+            
         except Exception as e:
             messagebox.showerror("Error", f"Analysis failed: {str(e)}")
+        
+        self.show_response_stats()
+
+    def show_response_stats(self):
+        # Model response health for this session
+        stats = self.keyword_extractor.recovery.report()
+        ttk.Label(self.results_frame,
+                 text=(f"Model responses: {stats['clean']} clean, {stats['recovered']} recovered, "
+                       f"{stats['failed']} failed, {stats['api_errors']} API errors "
+                       f"({stats['followup_calls']} follow-up calls, {stats['full_retries']} full retries)"),
+                 style='Subtitle.TLabel',
+                 wraplength=300).pack(side=tk.BOTTOM, pady=5)
 
     def run(self):
         self.root.mainloop()
\ No newline at end of file
@@ -1,13 +1,22 @@
 import google.generativeai as genai
 from typing import Dict
 import json
+from analysis_result import AnalysisResult, find_invalid_fields
+from response_repair import ResponseRecovery
+
+# A targeted follow-up is only worthwhile when most of the analysis survived
+MAX_FOLLOWUP_FIELDS = 3
+
+class ModelCallError(Exception):
+    """The model call itself failed (quota, network, blocked response)"""
 
 class KeywordExtractor:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, recovery: ResponseRecovery = None):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
+        self.recovery = recovery or ResponseRecovery()
         
-    def analyze_match(self, resume_text: str, job_desc: str) -> str:
+    def analyze_match(self, resume_text: str, job_desc: str) -> AnalysisResult:
         prompt = """
         You are a professional resume analyzer and ATS (Applicant Tracking System) expert. Analyze the provided resume and job description with extreme attention to detail. Follow these strict guidelines:
 
@@ -85,6 +94,42 @@ class KeywordExtractor:
         6. Consider industry standards and best practices
         """.format(resume_text, job_desc)
 
+        try:
+            # Extract and repair the JSON object instead of discarding an imperfect response
+            parsed_json, repaired = self.recovery.parse(self._generate(prompt))
+            
+            # Too little survived for a targeted follow-up: re-run the full prompt once so the
+            # scoring rules still apply, rather than rebuilding the analysis field by field
+            invalid_fields = find_invalid_fields(parsed_json)
+            if len(invalid_fields) > MAX_FOLLOWUP_FIELDS:
+                self.recovery.full_retries += 1
+                parsed_json, _ = self.recovery.parse(self._generate(prompt))
+                repaired = True
+                invalid_fields = find_invalid_fields(parsed_json)
+                if len(invalid_fields) > MAX_FOLLOWUP_FIELDS:
+                    raise ValueError(f"Model response was missing or invalid in: {', '.join(invalid_fields)}")
+            
+            # Re-request only the fields that are still missing or invalid
+            if invalid_fields:
+                parsed_json = self._request_missing_fields(parsed_json, invalid_fields, resume_text, job_desc)
+                repaired = True
+            
+            # Validate JSON structure and build the typed result
+            result = AnalysisResult.from_dict(parsed_json)
+            self.recovery.record(repaired)
+            return result
+            
+        except ModelCallError as e:
+            # Already counted as an API error, not a malformed response
+            raise ValueError(f"Error in analysis: {str(e)}")
+        except json.JSONDecodeError as e:
+            self.recovery.record_failure(e)
+            raise ValueError(f"Invalid JSON response from model: {str(e)}")
+        except Exception as e:
+            self.recovery.record_failure(e)
+            raise ValueError(f"Error in analysis: {str(e)}")
+
+    def _generate(self, prompt: str) -> str:
         try:
             # Set temperature to 0.1 for slight variation while maintaining consistency
             response = self.model.generate_content(
@@ -96,38 +141,34 @@ class KeywordExtractor:
                     candidate_count=1
                 )
             )
-        
-            
-            # Clean and validate response
-            cleaned_response = response.text.strip()
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response[7:-3]
-            
-            # Validate JSON structure
-            parsed_json = json.loads(cleaned_response)
-            
-            # Additional validation
-            required_fields = ['match_percentage', 'matching_keywords', 'missing_keywords', 
-                            'suggestions', 'ats_compatibility']
-            for field in required_fields:
-                if field not in parsed_json:
-                    raise ValueError(f"Missing required field: {field}")
-                
-            if not isinstance(parsed_json['match_percentage'], (int, float)):
-                raise ValueError("match_percentage must be a number")
-                
-            if parsed_json['match_percentage'] < 0 or parsed_json['match_percentage'] > 100:
-                raise ValueError("match_percentage must be between 0 and 100")
-            
-            # Validate ATS compatibility structure
-            ats_fields = ['score', 'will_pass_ats', 'issues', 'improvements']
-            for field in ats_fields:
-                if field not in parsed_json['ats_compatibility']:
-                    raise ValueError(f"Missing ATS compatibility field: {field}")
-            
-            return cleaned_response
-            
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from model: {str(e)}")
+            # .text raises for blocked or empty candidates
+            return response.text
         except Exception as e:
-            raise ValueError(f"Error in analysis: {str(e)}")
\ No newline at end of file
+            self.recovery.record_api_error(e)
+            raise ModelCallError(str(e)) from e
+
+    def _request_missing_fields(self, parsed_json: Dict, fields, resume_text: str, job_desc: str) -> Dict:
+        """Ask the model for just the fields a response was missing and merge them in"""
+        self.recovery.followup_calls += 1
+        self.recovery.drop_fields(parsed_json, fields)
+        
+        prompt = """
+        You analyzed the resume below against the job description, but these fields of your JSON answer were missing or invalid: {}
+
+        RESUME:
+        {}
+
+        JOB DESCRIPTION:
+        {}
+
+        PARTIAL ANALYSIS SO FAR:
+        {}
+
+        Return ONLY a JSON object containing just those fields, consistent with the partial analysis.
+        Fields named "ats_compatibility.<name>" go inside an "ats_compatibility" object.
+        match_percentage and score are numbers from 0 to 100, will_pass_ats is a boolean,
+        and every other field is a list of strings.
+        """.format(", ".join(fields), resume_text, job_desc, json.dumps(parsed_json, indent=2))
+        
+        update, _ = self.recovery.parse(self._generate(prompt))
+        return self.recovery.merge(parsed_json, update, fields)
\ No newline at end of file
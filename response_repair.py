@@ -0,0 +1,271 @@
+import json
+import logging
+import re
+
+# A JSON string literal, honouring escapes
+_STRING = r'"(?:[^"\\]|\\.)*"'
+
+# Markdown code fence (``` or ~~~, optional language tag); the closing fence may be cut off
+_OUTER_FENCE = re.compile(r"^(`{3,}|~{3,})[^\n]*\n(.*?)\n?\1$", re.DOTALL)
+_FENCE = re.compile(r"(`{3,}|~{3,})[^\n]*\n(.*?)(?:\n?\1|$)", re.DOTALL)
+
+# First non-whitespace character at a position
+_NEXT_CHAR = re.compile(r"\s*(\S)")
+
+# A number or literal ending truncated output; it may itself have been cut short
+_TRAILING_SCALAR = re.compile(r"(?<=[:\[,])\s*(?:-?[\d.eE+-]+|true|false|null)$")
+
+# An extracted object must carry at least one of these, so nested objects are never mistaken for it
+_TOP_LEVEL_FIELDS = ("match_percentage", "matching_keywords", "missing_keywords",
+                     "suggestions", "ats_compatibility")
+
+_NUMBER_FIELDS = ("match_percentage", "ats_compatibility.score")
+_BOOL_FIELDS = ("ats_compatibility.will_pass_ats",)
+_LIST_FIELDS = ("matching_keywords", "missing_keywords", "suggestions",
+                "ats_compatibility.issues", "ats_compatibility.improvements")
+
+_TRUE_WORDS = ("true", "yes", "y", "pass", "passes", "1")
+_FALSE_WORDS = ("false", "no", "n", "fail", "fails", "0")
+
+
+class ResponseRecovery:
+    """Recover an analysis object from imperfect model output.
+
+    Handles JSON wrapped in prose or any code fence style, trailing commas,
+    truncated output (unterminated strings, arrays and objects) and values of
+    the wrong type such as ``"85%"`` for a number. Counters record how many
+    responses were clean, recovered or unrecoverable.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.clean = 0
+        self.recovered = 0
+        self.failed = 0
+        self.api_errors = 0
+        self.followup_calls = 0
+        self.full_retries = 0
+
+    def parse(self, text):
+        """Return (data, repaired) for a model response, raising ValueError if unrecoverable"""
+        text = (text or "").strip()
+
+        # A single outer code fence is the normal shape of a model reply, not a defect
+        fenced = _OUTER_FENCE.match(text)
+        try:
+            data = json.loads(fenced.group(2) if fenced else text)
+            repaired = False
+        except json.JSONDecodeError:
+            data = None
+
+        if not self._is_analysis(data):
+            # Also covers valid JSON of the wrong shape, e.g. the object wrapped in a list
+            data = self.extract_json(text)
+            repaired = True
+        return data, self.coerce_types(data) or repaired
+
+    @staticmethod
+    def _is_analysis(data):
+        # Follow-up replies may use flattened names such as "ats_compatibility.score"
+        return isinstance(data, dict) and any(key.split(".")[0] in _TOP_LEVEL_FIELDS for key in data)
+
+    def extract_json(self, text):
+        """Find and repair the JSON object in text, raising JSONDecodeError if there is none"""
+        # Prefer fenced blocks so braces in surrounding prose are not mistaken for the object
+        blocks = [match.group(2) for match in _FENCE.finditer(text)] or [text]
+        error = None
+        for block in blocks:
+            start = block.find("{")
+            while start != -1:
+                try:
+                    data = json.loads(self.repair_json(block, start))
+                    if self._is_analysis(data):
+                        return data
+                except json.JSONDecodeError as e:
+                    error = e
+                start = block.find("{", start + 1)
+        raise error or json.JSONDecodeError("No analysis object found", text, 0)
+
+    def repair_json(self, text, start=0):
+        """Repair the JSON object starting at text[start] and fix common syntax defects"""
+        out = []
+        stack = []
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    # A quote not followed by a delimiter is an unescaped quote inside the text
+                    following = _NEXT_CHAR.match(text, i + 1)
+                    if following and following.group(1) not in ",:}]":
+                        out.append('\\"')
+                        continue
+                    in_string = False
+                out.append(ch)
+            elif ch == '"':
+                in_string = True
+                out.append(ch)
+            elif ch in "{[":
+                stack.append("}" if ch == "{" else "]")
+                out.append(ch)
+            elif ch in "}]":
+                if not stack or stack[-1] != ch:
+                    continue
+                self._drop_trailing_comma(out)
+                out.append(stack.pop())
+                if not stack:
+                    # Object complete; ignore any prose or closing fence after it
+                    return "".join(out)
+            else:
+                out.append(ch)
+
+        # Truncated output: close the open string, drop incomplete tokens, close containers
+        if in_string:
+            if escaped:
+                out.pop()
+            out.append('"')
+            repaired = "".join(out)
+        else:
+            # A final number may have lost digits ("8" of "85"), so let the follow-up refetch it
+            repaired = _TRAILING_SCALAR.sub("", "".join(out).rstrip())
+        while stack:
+            repaired = self._trim_incomplete(repaired, stack[-1])
+            repaired += stack.pop()
+        return repaired
+
+    @staticmethod
+    def _drop_trailing_comma(out):
+        i = len(out) - 1
+        while i >= 0 and out[i].isspace():
+            i -= 1
+        if i >= 0 and out[i] == ",":
+            del out[i:]
+
+    @staticmethod
+    def _trim_incomplete(text, closer):
+        while True:
+            text = text.rstrip()
+            if text.endswith(","):
+                text = text[:-1]
+                continue
+            # Key whose value was cut off
+            match = re.search(_STRING + r"\s*:$", text)
+            if match:
+                text = text[:match.start()]
+                continue
+            # Key without a colon
+            if closer == "}":
+                match = re.search(r"[{,]\s*(" + _STRING + r")$", text)
+                if match:
+                    text = text[:match.start(1)]
+                    continue
+            # Partial literal such as "tru" or a number cut at "12."
+            match = re.search(r"[:\[,]\s*([A-Za-z]+)$", text)
+            if match and match.group(1) not in ("true", "false", "null"):
+                text = text[:match.start(1)]
+                continue
+            match = re.search(r"(?<=[\d:\[,\s])[.eE+-]+$", text)
+            if match:
+                text = text[:match.start()]
+                continue
+            return text
+
+    def coerce_types(self, data):
+        """Fix string-typed numbers and booleans in place, returning True if anything changed"""
+        changed = False
+        for path in _NUMBER_FIELDS:
+            value = self._get(data, path)
+            if isinstance(value, str):
+                match = re.search(r"-?\d+(?:\.\d+)?", value)
+                if match:
+                    number = float(match.group())
+                    self._set(data, path, int(number) if number.is_integer() else number)
+                    changed = True
+        for path in _BOOL_FIELDS:
+            value = self._get(data, path)
+            if isinstance(value, str) and value.strip().lower() in _TRUE_WORDS + _FALSE_WORDS:
+                self._set(data, path, value.strip().lower() in _TRUE_WORDS)
+                changed = True
+        for path in _LIST_FIELDS:
+            value = self._get(data, path)
+            if isinstance(value, str):
+                self._set(data, path, [value] if value.strip() else [])
+                changed = True
+            elif isinstance(value, list) and not all(isinstance(item, str) for item in value):
+                self._set(data, path, [item if isinstance(item, str) else json.dumps(item)
+                                       for item in value if item is not None])
+                changed = True
+        return changed
+
+    @staticmethod
+    def _get(data, path):
+        for key in path.split("."):
+            if not isinstance(data, dict) or key not in data:
+                return None
+            data = data[key]
+        return data
+
+    @staticmethod
+    def _set(data, path, value):
+        *parents, key = path.split(".")
+        for parent in parents:
+            data = data[parent]
+        data[key] = value
+
+    def drop_fields(self, data, paths):
+        """Remove fields that will be re-requested and any unknown keys, keeping ats_compatibility an object"""
+        for key in [key for key in data if key not in _TOP_LEVEL_FIELDS]:
+            del data[key]
+        if not isinstance(data.get("ats_compatibility"), dict):
+            data["ats_compatibility"] = {}
+        for path in paths:
+            *parents, key = path.split(".")
+            section = data
+            for parent in parents:
+                section = section[parent]
+            section.pop(key, None)
+        return data
+
+    def merge(self, data, update, paths):
+        """Copy the requested fields from a follow-up response into a partial analysis"""
+        for path in paths:
+            # Tolerate flattened names like "ats_compatibility.score" in the follow-up
+            value = update[path] if path in update else self._get(update, path)
+            if value is not None:
+                self._set(data, path, value)
+        self.coerce_types(data)
+        return data
+
+    def record(self, repaired):
+        """Count a response that produced a valid analysis"""
+        if repaired:
+            self.recovered += 1
+            self.logger.info(f"Recovered malformed model response ({self.recovered} so far)")
+        else:
+            self.clean += 1
+
+    def record_failure(self, error):
+        """Count a response that could not be turned into a valid analysis"""
+        self.failed += 1
+        self.logger.warning(f"Unrecoverable model response ({self.failed} so far): {error}")
+
+    def record_api_error(self, error):
+        """Count a model call that failed before returning a response"""
+        self.api_errors += 1
+        self.logger.warning(f"Model call failed ({self.api_errors} so far): {error}")
+
+    def report(self):
+        """Summarize how model responses were handled"""
+        return {
+            "clean": self.clean,
+            "recovered": self.recovered,
+            "failed": self.failed,
+            "api_errors": self.api_errors,
+            "followup_calls": self.followup_calls,
+            "full_retries": self.full_retries,
+        }
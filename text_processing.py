@@ -1,6 +1,5 @@
 import PyPDF2
 import re
-import io
 import pdfplumber
 from pdfminer.high_level import extract_text as pdfminer_extract
 import fitz  # PyMuPDF
@@ -10,6 +9,7 @@ import docx2txt
 import pdf2docx
 import tempfile
 import os
+from document_source import DocumentSource
 
 class TextProcessor:
     def __init__(self):
@@ -38,8 +38,10 @@ class TextProcessor:
 
     def extract_text_from_pdf(self, uploaded_file):
         """Try multiple PDF extraction methods"""
+        source = None
         try:
-            pdf_bytes = uploaded_file.read()
+            # Accepts an upload, a file path (memory-mapped) or bytes; the document is held once
+            source = DocumentSource.coerce(uploaded_file)
             text = ""
             
             # Try all PDF extraction methods
@@ -52,8 +54,7 @@ class TextProcessor:
             
             for method in extraction_methods:
                 try:
-                    pdf_file = io.BytesIO(pdf_bytes)
-                    text = method(pdf_file)
+                    text = method(source)
                     if text.strip():
                         return self.clean_extracted_text(text)
                 except Exception as e:
@@ -63,7 +64,7 @@ class TextProcessor:
             # If all methods fail, try PDF to DOCX conversion
             if not text.strip():
                 self.logger.info("Attempting PDF to DOCX conversion...")
-                text = self._convert_pdf_to_docx_and_extract(pdf_bytes)
+                text = self._convert_pdf_to_docx_and_extract(source)
                 if text.strip():
                     return self.clean_extracted_text(text)
             
@@ -75,20 +76,21 @@ class TextProcessor:
         except Exception as e:
             self.logger.error(f"PDF extraction failed: {str(e)}")
             raise ValueError(f"Could not process PDF: {str(e)}")
+        finally:
+            if source is not None and source is not uploaded_file:
+                source.close()
 
-    def _convert_pdf_to_docx_and_extract(self, pdf_bytes):
+    def _convert_pdf_to_docx_and_extract(self, source):
         """Convert PDF to DOCX and extract text"""
         with tempfile.TemporaryDirectory() as temp_dir:
-            pdf_path = os.path.join(temp_dir, "temp.pdf")
             docx_path = os.path.join(temp_dir, "temp.docx")
             
-            # Save PDF bytes to temporary file
-            with open(pdf_path, 'wb') as f:
-                f.write(pdf_bytes)
-            
-            # Convert PDF to DOCX
+            # Convert straight from the original file or in-memory bytes, no temporary PDF copy
             try:
-                converter = pdf2docx.Converter(pdf_path)
+                if source.path:
+                    converter = pdf2docx.Converter(source.path)
+                else:
+                    converter = pdf2docx.Converter(stream=bytes(source.data))
                 converter.convert(docx_path)
                 converter.close()
                 
@@ -99,47 +101,52 @@ class TextProcessor:
                 self.logger.error(f"PDF to DOCX conversion failed: {str(e)}")
                 return ""
 
-    def _extract_with_pymupdf(self, pdf_file):
+    def _extract_with_pymupdf(self, source):
         """Extract text using PyMuPDF"""
-        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
+        # MuPDF reads files itself; bytes(...) is a no-op for a bytes source
+        if source.path:
+            doc = fitz.open(source.path)
+        else:
+            doc = fitz.open(stream=bytes(source.data), filetype="pdf")
         text = ""
         for page in doc:
             text += page.get_text()
         doc.close()
         return text
 
-    def _extract_with_pdfplumber(self, pdf_file):
+    def _extract_with_pdfplumber(self, source):
         """Extract text using pdfplumber"""
-        with pdfplumber.open(pdf_file) as pdf:
+        with source.open() as pdf_file, pdfplumber.open(pdf_file) as pdf:
             return " ".join(page.extract_text() or "" for page in pdf.pages)
 
-    def _extract_with_pdfminer(self, pdf_file):
+    def _extract_with_pdfminer(self, source):
         """Extract text using PDFMiner"""
-        return pdfminer_extract(pdf_file)
+        with source.open() as pdf_file:
+            return pdfminer_extract(pdf_file)
 
-    def _extract_with_pypdf2(self, pdf_file):
+    def _extract_with_pypdf2(self, source):
         """Extract text using PyPDF2"""
-        reader = PyPDF2.PdfReader(pdf_file)
-        return " ".join(page.extract_text() or "" for page in reader.pages)
+        with source.open() as pdf_file:
+            reader = PyPDF2.PdfReader(pdf_file)
+            return " ".join(page.extract_text() or "" for page in reader.pages)
 
     def extract_text_from_docx(self, uploaded_file):
         """Extract text from DOCX file"""
+        source = None
         try:
-            # Save the uploaded file to a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-
-            # Extract text from the temporary file
-            text = docx2txt.process(tmp_file_path)
+            source = DocumentSource.coerce(uploaded_file)
             
-            # Clean up
-            os.unlink(tmp_file_path)
+            # docx2txt reads the zip archive straight from the shared buffer
+            with source.open() as docx_file:
+                text = docx2txt.process(docx_file)
             
             return self.clean_extracted_text(text)
         except Exception as e:
             self.logger.error(f"DOCX extraction failed: {str(e)}")
             raise ValueError(f"Could not process DOCX: {str(e)}")
+        finally:
+            if source is not None and source is not uploaded_file:
+                source.close()
 
     def clean_extracted_text(self, text):
         """Clean the extracted text"""